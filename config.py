@@ -1,15 +1,52 @@
 #!/usr/bin/env python3\
 
+import os
+
+
+def _load_env_file(path: str = '.env') -> None:
+    """Загрузка переменных KEY=VALUE из файла .env (уже заданные не меняются)."""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding='utf-8') as env_file:
+        for line in env_file:
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            key, value = line.split('=', 1)
+            os.environ.setdefault(key.strip(), value.strip().strip('\'"'))
+
+
+_load_env_file()
+
 # Конфигурационные параметры для бота и базы данных
+# (каждый можно переопределить переменной окружения или в файле .env)
 DB_CONFIG = {
-    'dbname': 'english_bot',      # Название базы данных
-    'user': 'postgres',           # Пользователь PostgreSQL
-    'password': 'postgres',       # Пароль пользователя
-    'host': 'localhost',          # Хост базы данных
-    'port': '5432'                # Порт базы данных
+    'dbname': os.environ.get('DB_NAME', 'english_bot'),      # Название базы данных
+    'user': os.environ.get('DB_USER', 'postgres'),           # Пользователь PostgreSQL
+    'password': os.environ.get('DB_PASSWORD', 'postgres'),   # Пароль пользователя
+    'host': os.environ.get('DB_HOST', 'localhost'),          # Хост базы данных
+    'port': os.environ.get('DB_PORT', '5432'),               # Порт базы данных
+    'connect_timeout': 5          # Таймаут подключения к базе данных (сек)
 }
 
-BOT_TOKEN = 'YOUR_TELEGRAM_BOT_TOKEN'  # Токен вашего Telegram бота
+# Настройки пула соединений с базой данных
+DB_POOL = {
+    'minconn': 2,                 # Соединений, открываемых при запуске
+    'maxconn': 16,                # Максимум соединений (не меньше num_threads)
+    # PREPARE для частых запросов (DB_PREPARE_STATEMENTS=0 для PgBouncer transaction)
+    'prepare_statements': os.environ.get('DB_PREPARE_STATEMENTS', '1') != '0'
+}
+
+BOT_TOKEN = os.environ.get('BOT_TOKEN', 'YOUR_TELEGRAM_BOT_TOKEN')  # Токен вашего Telegram бота
+
+# Настройки webhook (если url не задан, бот работает через long polling)
+WEBHOOK = {
+    'url': None,                  # Внешний HTTPS-адрес бота, например 'https://example.com:8443'
+    'listen': '0.0.0.0',          # Адрес, на котором слушает встроенный сервер
+    'port': 8443,                 # Порт (Telegram поддерживает 443, 80, 88, 8443)
+    'certificate': None,          # Путь к TLS-сертификату (для самоподписанного)
+    'certificate_key': None       # Путь к ключу TLS-сертификата
+}
 
 # Настройки викторины
 QUIZ_SETTINGS = {
@@ -22,3 +59,17 @@ INTERFACE = {
     'words_per_page': 10,         # Количество слов на странице в списке
     'max_word_length': 255        # Максимальная длина слова
 }
+
+# Настройки бота
+BOT_SETTINGS = {
+    'num_threads': 8,             # Количество потоков-обработчиков сообщений
+    'polling_timeout': 30,        # Таймаут HTTP-запроса getUpdates (сек)
+    'long_polling_timeout': 25,   # Сколько Telegram держит getUpdates открытым (сек)
+    'skip_pending': True,         # Пропускать сообщения, пришедшие до запуска
+    'user_cache_size': 10000,     # Размер кэша Telegram ID -> ID пользователя
+    'words_cache_size': 1000,     # Сколько пользователей держать в кэше слов
+    'state_cache_size': 100000,   # Максимум пользователей с незавершенным действием
+    'state_ttl': 3600,            # Время жизни незавершенного действия (сек)
+    'messages_per_second': 28,    # Скорость отправки исходящих сообщений в секунду
+    'messages_burst': 2           # Сколько сообщений можно отправить сразу (с ней не больше 30/с)
+}
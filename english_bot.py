@@ -1,19 +1,97 @@
 #!/usr/bin/env python3
 
-import re
 import os
+import re
+import sys
+import json
 import time
+import queue
 import random
-import socket
-import platform
-import subprocess
-from typing import Optional, Tuple, List, Dict, Any
+import logging
+import threading
+import logging.handlers
+from contextlib import contextmanager
+from typing import Optional, Tuple, List, Dict, Any, Iterator
 import telebot
 import psycopg2
 from telebot import types
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from telebot.apihelper import ApiTelegramException
+from psycopg2 import sql
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT, connection as PgConnection
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from cachetools import LRUCache, TTLCache
+
+from config import (
+    DB_CONFIG, DB_POOL, BOT_TOKEN, QUIZ_SETTINGS, INTERFACE, BOT_SETTINGS, WEBHOOK
+)
 
-from config import DB_CONFIG, BOT_TOKEN, QUIZ_SETTINGS, INTERFACE
+
+logger = logging.getLogger(__name__)
+
+
+class _PreparingConnection(PgConnection):
+    """Соединение, помнящее подготовленные на нем запросы."""
+    
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+class _LockedTTLCache(TTLCache):
+    """TTLCache, доступ к которому защищен блокировкой."""
+    
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        super().__init__(maxsize, ttl)
+        self._lock = threading.RLock()
+    
+    def __getitem__(self, key: Any) -> Any:
+        with self._lock:
+            return super().__getitem__(key)
+    
+    def __setitem__(self, key: Any, value: Any) -> None:
+        with self._lock:
+            super().__setitem__(key, value)
+    
+    def __delitem__(self, key: Any) -> None:
+        with self._lock:
+            super().__delitem__(key)
+    
+    def __contains__(self, key: Any) -> bool:
+        with self._lock:
+            return super().__contains__(key)
+    
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            return super().get(key, default)
+    
+    def pop(self, key: Any, *default: Any) -> Any:
+        with self._lock:
+            return super().pop(key, *default)
+
+
+class _RateLimiter:
+    """Ограничитель частоты запросов (token bucket)."""
+    
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Ожидание, пока не освободится токен."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
 
 
 class EnglishBot:
@@ -23,89 +101,243 @@ class EnglishBot:
     IDLE = 'idle'
     ADDING_WORD_RUSSIAN = 'adding_word_russian'
     ADDING_WORD_ENGLISH = 'adding_word_english'
-    DELETING_WORD = 'deleting_word'
     QUIZ = 'quiz'
     VIEWING_WORDS = 'viewing_words'
     
+    # Версия схемы БД; увеличивается при любом изменении create_tables
+    SCHEMA_VERSION = '1'
+    
     def __init__(self, token: str, db_config: Dict[str, Any]) -> None:
         """Инициализация бота и базы данных."""
         self.token = token
         self.db_config = db_config
-        self.bot = telebot.TeleBot(token)
-        self.user_states = {}  # Состояния пользователей
-        self.temp_data = {}    # Временные данные
-        self.quiz_data = {}    # Данные викторины
-        self.words_pagination = {}  # Пагинация для списка слов
-        self.conn = None
-        self.cursor = None
-        self.connect_to_database()
+        self.bot = telebot.TeleBot(token, num_threads=BOT_SETTINGS['num_threads'])
+        # Данные незавершенных действий пользователей удаляются по истечении TTL
+        state_size = BOT_SETTINGS['state_cache_size']
+        state_ttl = BOT_SETTINGS['state_ttl']
+        self.user_states = _LockedTTLCache(state_size, state_ttl)  # Состояния пользователей
+        self.temp_data = _LockedTTLCache(state_size, state_ttl)    # Временные данные
+        self.quiz_data = _LockedTTLCache(state_size, state_ttl)    # Данные викторины
+        # Кэш слов пользователей
+        self._user_words_cache = LRUCache(maxsize=BOT_SETTINGS['words_cache_size'])
+        self._user_words_lock = threading.Lock()
+        # Счетчик изменений словарей: результат запроса, начатого до изменения,
+        # не попадает в кэш
+        self._user_words_generation = 0
+        # Кэш соответствия Telegram ID -> ID пользователя
+        self._user_ids = LRUCache(maxsize=BOT_SETTINGS['user_cache_size'])
+        self._user_ids_lock = threading.Lock()
+        self._rng = random.Random()  # Генератор случайных чисел для викторины
+        # Ограничение исходящих сообщений ниже лимита Telegram (30 в секунду)
+        self._send_limiter = _RateLimiter(
+            BOT_SETTINGS['messages_per_second'], BOT_SETTINGS['messages_burst']
+        )
+        self.pool = None
+        # Запросы _execute_prepared, переведенные в формат psycopg2 (без PREPARE)
+        self._pyformat_queries: Dict[str, str] = {}
+        # Неизменные клавиатуры сериализуются в JSON один раз
+        self._main_markup = self._build_main_keyboard().to_json()
+        self._cancel_markup = self._build_cancel_keyboard().to_json()
+        if not self.connect_to_database():
+            raise RuntimeError("База данных не готова к работе")
         self._register_handlers()
     
     def connect_to_database(self) -> bool:
         """Подключение к базе данных."""
         try:
-            self.conn = psycopg2.connect(
+            self.pool = ThreadedConnectionPool(
+                DB_POOL['minconn'], DB_POOL['maxconn'],
                 dbname=self.db_config['dbname'],
                 user=self.db_config['user'],
                 password=self.db_config['password'],
                 host=self.db_config['host'],
-                port=self.db_config['port']
+                port=self.db_config['port'],
+                connect_timeout=self.db_config['connect_timeout'],
+                connection_factory=_PreparingConnection
             )
-            self.conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-            self.cursor = self.conn.cursor()
-            print("Успешное подключение к базе данных")
+            logger.info("Успешное подключение к базе данных")
             
-            self.create_tables()
-            self.fill_common_words()
+            if self.get_schema_version() != self.SCHEMA_VERSION:
+                # Без полной схемы (например, без uq_words_pair) add_word не работает
+                if not (self.create_tables() and self.fill_common_words()
+                        and self.set_schema_version()):
+                    logger.error("Не удалось подготовить схему базы данных")
+                    return False
             
             return True
         except Exception as e:
-            print(f"Ошибка подключения к базе данных: {e}")
+            logger.error("Ошибка подключения к базе данных: %s", e)
+            return False
+    
+    @contextmanager
+    def _cursor(self) -> Iterator[Any]:
+        """Курсор на соединении, взятом из пула."""
+        conn = self.pool.getconn()
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                yield cursor
+        finally:
+            # Разорванное соединение закрывается, а не возвращается в пул
+            self.pool.putconn(conn, close=bool(conn.closed))
+    
+    def _execute_prepared(
+        self, cursor: Any, name: str, param_types: Tuple[str, ...], query: str, params: Tuple
+    ) -> None:
+        """Выполнение запроса, подготовленного на сервере (PREPARE при первом вызове)."""
+        if not DB_POOL['prepare_statements']:
+            # PgBouncer в режиме transaction не поддерживает PREPARE:
+            # $n заменяются на именованные параметры psycopg2 один раз на запрос,
+            # а % экранируется, чтобы текст запроса значил то же, что и в PREPARE
+            text = self._pyformat_queries.get(name)
+            if text is None:
+                text = re.sub(r'\$(\d+)', r'%(p\1)s', query.replace('%', '%%'))
+                self._pyformat_queries[name] = text
+            cursor.execute(text, {f"p{i}": value for i, value in enumerate(params, 1)})
+            return
+        
+        conn = cursor.connection
+        if name not in conn.prepared:
+            cursor.execute(f"PREPARE {name} ({', '.join(param_types)}) AS {query}")
+            conn.prepared.add(name)
+        cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+    
+    def get_schema_version(self) -> Optional[str]:
+        """Получение версии схемы, записанной в базе данных."""
+        try:
+            with self._cursor() as cursor:
+                cursor.execute("SELECT value FROM meta WHERE key = 'schema_version'")
+                row = cursor.fetchone()
+                return row[0] if row else None
+        except psycopg2.errors.UndefinedTable:
+            return None
+        except Exception as e:
+            logger.error("Ошибка при получении версии схемы: %s", e)
+            return None
+    
+    def set_schema_version(self) -> bool:
+        """Сохранение текущей версии схемы в базе данных."""
+        try:
+            with self._cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO meta (key, value) VALUES ('schema_version', %s)
+                    ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+                    """,
+                    (self.SCHEMA_VERSION,)
+                )
+                return True
+        except Exception as e:
+            logger.error("Ошибка при сохранении версии схемы: %s", e)
             return False
     
     def create_tables(self) -> bool:
         """Создание таблиц в базе данных."""
         try:
-            # Создание таблицы пользователей
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id SERIAL PRIMARY KEY,
-                    telegram_id BIGINT UNIQUE NOT NULL,
-                    username VARCHAR(255),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Создание таблицы слов
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS words (
-                    id SERIAL PRIMARY KEY,
-                    russian_word VARCHAR(255) NOT NULL,
-                    english_word VARCHAR(255) NOT NULL,
-                    is_common BOOLEAN DEFAULT FALSE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Создание таблицы слов пользователей
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_words (
-                    id SERIAL PRIMARY KEY,
-                    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
-                    word_id INTEGER REFERENCES words(id) ON DELETE CASCADE,
-                    correct_count INTEGER DEFAULT 0,
-                    attempt_count INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(user_id, word_id)
-                )
-            ''')
-            
-            print("Таблицы успешно созданы")
-            return True
+            with self._cursor() as cursor:
+                # Создание служебной таблицы с версией схемы
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS meta (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL
+                    )
+                ''')
+                
+                # Создание таблицы пользователей
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS users (
+                        id SERIAL PRIMARY KEY,
+                        telegram_id BIGINT UNIQUE NOT NULL,
+                        username VARCHAR(255),
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                
+                # Создание таблицы слов
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS words (
+                        id SERIAL PRIMARY KEY,
+                        russian_word VARCHAR(255) NOT NULL,
+                        english_word VARCHAR(255) NOT NULL,
+                        is_common BOOLEAN DEFAULT FALSE,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                
+                # Создание таблицы слов пользователей
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS user_words (
+                        id SERIAL PRIMARY KEY,
+                        user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+                        word_id INTEGER REFERENCES words(id) ON DELETE CASCADE,
+                        correct_count INTEGER DEFAULT 0,
+                        attempt_count INTEGER DEFAULT 0,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        UNIQUE(user_id, word_id)
+                    )
+                ''')
+                
+                # Индексы для выборок по пользователю и общих слов
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_user_words_user
+                    ON user_words(user_id) INCLUDE (word_id, correct_count, attempt_count)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_words_common
+                    ON words(is_common) WHERE is_common
+                ''')
+                
+                # Уникальность пары слов нужна для upsert в add_word;
+                # в базе, созданной до появления индекса, могут быть дубликаты
+                self._merge_duplicate_words(cursor)
+                cursor.execute('''
+                    CREATE UNIQUE INDEX IF NOT EXISTS uq_words_pair
+                    ON words(russian_word, english_word)
+                ''')
+                
+                logger.info("Таблицы успешно созданы")
+                return True
         except Exception as e:
-            print(f"Ошибка создания таблиц: {e}")
+            logger.error("Ошибка создания таблиц: %s", e)
             return False
     
+    def _merge_duplicate_words(self, cursor: Any) -> None:
+        """Объединение повторяющихся пар слов в одну запись с наименьшим ID.
+        
+        Каждый шаг можно безопасно повторить, если предыдущий запуск прервался.
+        Статистика второй связи пользователя с той же парой отбрасывается.
+        """
+        duplicates = """
+            SELECT id, keep_id FROM (
+                SELECT id, MIN(id) OVER (PARTITION BY russian_word, english_word) AS keep_id
+                FROM words
+            ) w
+            WHERE id <> keep_id
+        """
+        # Лишние связи пользователя с одной и той же парой слов
+        cursor.execute(f"""
+            DELETE FROM user_words WHERE id IN (
+                SELECT id FROM (
+                    SELECT uw.id, ROW_NUMBER() OVER (
+                        PARTITION BY uw.user_id, COALESCE(d.keep_id, uw.word_id)
+                        ORDER BY uw.word_id
+                    ) AS rn
+                    FROM user_words uw
+                    LEFT JOIN ({duplicates}) d ON d.id = uw.word_id
+                ) ranked
+                WHERE rn > 1
+            )
+        """)
+        # Оставшиеся связи переносятся на сохраняемую запись
+        cursor.execute(f"""
+            UPDATE user_words uw SET word_id = d.keep_id
+            FROM ({duplicates}) d
+            WHERE uw.word_id = d.id
+        """)
+        cursor.execute(f"DELETE FROM words WHERE id IN (SELECT id FROM ({duplicates}) d)")
+        if cursor.rowcount:
+            logger.info("Объединено повторяющихся слов: %s", cursor.rowcount)
+
     def fill_common_words(self) -> bool:
         """Заполнение базы данных общим набором слов."""
         common_words = [
@@ -122,24 +354,36 @@ class EnglishBot:
         ]
         
         try:
-            self.cursor.execute("SELECT COUNT(*) FROM words WHERE is_common = TRUE")
-            count = self.cursor.fetchone()[0]
-            
-            if count == 0:
-                for russian, english in common_words:
-                    self.cursor.execute(
-                        "INSERT INTO words (russian_word, english_word, is_common) "
-                        "VALUES (%s, %s, TRUE)",
-                        (russian, english)
+            with self._cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) FROM words WHERE is_common = TRUE")
+                count = cursor.fetchone()[0]
+                
+                if count == 0:
+                    execute_values(
+                        cursor,
+                        "INSERT INTO words (russian_word, english_word, is_common) VALUES %s "
+                        "ON CONFLICT (russian_word, english_word) DO UPDATE SET is_common = TRUE",
+                        common_words,
+                        template="(%s, %s, TRUE)",
+                        page_size=1000
                     )
-                print(f"Добавлено {len(common_words)} общих слов")
-            return True
+                    logger.info("Добавлено %s общих слов", len(common_words))
+                return True
         except Exception as e:
-            print(f"Ошибка при заполнении общих слов: {e}")
+            logger.error("Ошибка при заполнении общих слов: %s", e)
             return False
     
-       def _register_handlers(self) -> None:
+    def _register_handlers(self) -> None:
         """Регистрация обработчиков сообщений."""
+        # Кнопки меню обрабатываются поиском по тексту сообщения
+        menu_handlers = {
+            'Викторина 🎮': self._handle_quiz,
+            'Добавить слово ➕': self._handle_add_word,
+            'Удалить слово ➖': self._handle_delete_word,
+            'Список слов 📋': self._handle_words_list,
+            'Отмена ❌': self._handle_cancel,
+        }
+        
         @self.bot.message_handler(commands=['start'])
         def handle_start(message: types.Message) -> None:
             self._handle_start(message)
@@ -148,29 +392,18 @@ class EnglishBot:
         def handle_help(message: types.Message) -> None:
             self._handle_help(message)
         
-        @self.bot.message_handler(func=lambda message: message.text == 'Викторина 🎮')
-        def handle_quiz(message: types.Message) -> None:
-            self._handle_quiz(message)
-        
-        @self.bot.message_handler(func=lambda message: message.text == 'Добавить слово ➕')
-        def handle_add_word(message: types.Message) -> None:
-            self._handle_add_word(message)
-        
-        @self.bot.message_handler(func=lambda message: message.text == 'Удалить слово ➖')
-        def handle_delete_word(message: types.Message) -> None:
-            self._handle_delete_word(message)
+        @self.bot.callback_query_handler(func=lambda call: call.data.startswith('words:'))
+        def handle_words_page(call: types.CallbackQuery) -> None:
+            self._handle_words_page(call)
         
-        @self.bot.message_handler(func=lambda message: message.text == 'Список слов 📋')
-        def handle_words_list(message: types.Message) -> None:
-            self._handle_words_list(message)
-        
-        @self.bot.message_handler(func=lambda message: message.text == 'Отмена ❌')
-        def handle_cancel(message: types.Message) -> None:
-            self._handle_cancel(message)
+        @self.bot.callback_query_handler(func=lambda call: call.data.startswith(('del:', 'delpage:')))
+        def handle_delete(call: types.CallbackQuery) -> None:
+            self._handle_delete_callback(call)
         
         @self.bot.message_handler(func=lambda message: True)
         def handle_messages(message: types.Message) -> None:
-            self._handle_messages(message)
+            handler = menu_handlers.get(message.text, self._handle_messages)
+            handler(message)
 
     def _handle_start(self, message: types.Message) -> None:
         """Обработчик команды /start."""
@@ -183,7 +416,7 @@ class EnglishBot:
             self.user_states[user_id] = self.IDLE
             markup = self._create_main_keyboard()
             
-            self.bot.send_message(
+            self._send(
                 user_id,
                 f"Привет, {username}! 👋\n\n"
                 "Я бот для изучения английских слов. С моей помощью ты сможешь:\n"
@@ -197,7 +430,7 @@ class EnglishBot:
 
     def _handle_help(self, message: types.Message) -> None:
         """Обработчик команды /help."""
-        self.bot.send_message(
+        self._send(
             message.from_user.id,
             "📚 *Справка по использованию бота* 📚\n\n"
             "*Основные команды:*\n"
@@ -218,29 +451,27 @@ class EnglishBot:
         db_user_id = self.get_user_id(user_id)
         
         if not db_user_id:
-            self.bot.send_message(user_id, "Пожалуйста, используйте /start для начала работы.")
+            self._send(user_id, "Пожалуйста, используйте /start для начала работы.")
             return
         
         word = self.get_random_word(db_user_id)
         
         if not word:
-            self.bot.send_message(
+            self._send(
                 user_id,
                 "У вас пока нет слов для викторины. Добавьте слова с помощью кнопки 'Добавить слово ➕'."
             )
             return
         
         word_id, russian_word, english_word = word
-        self.quiz_data[user_id] = word_id
+        self.quiz_data[user_id] = (word_id, english_word)
         
         options, correct_answer = self.get_options(word_id, db_user_id)
-        markup = types.ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
-        buttons = [types.KeyboardButton(option) for option in options]
-        markup.add(*buttons)
+        markup = self._build_quiz_keyboard(options)
         
         self.user_states[user_id] = self.QUIZ
         
-        self.bot.send_message(
+        self._send(
             user_id,
             f"Переведите слово: *{russian_word}*",
             reply_markup=markup,
@@ -252,14 +483,10 @@ class EnglishBot:
         user_id = message.from_user.id
         self.user_states[user_id] = self.ADDING_WORD_RUSSIAN
         
-        markup = types.ReplyKeyboardMarkup(resize_keyboard=True, row_width=1)
-        cancel_btn = types.KeyboardButton('Отмена ❌')
-        markup.add(cancel_btn)
-        
-        self.bot.send_message(
+        self._send(
             user_id,
             "Введите слово на русском языке:",
-            reply_markup=markup
+            reply_markup=self._cancel_markup
         )
 
     def _handle_delete_word(self, message: types.Message) -> None:
@@ -268,73 +495,171 @@ class EnglishBot:
         db_user_id = self.get_user_id(user_id)
         
         if not db_user_id:
-            self.bot.send_message(user_id, "Пожалуйста, используйте /start для начала работы.")
+            self._send(user_id, "Пожалуйста, используйте /start для начала работы.")
             return
         
         words = self.get_user_words(db_user_id)
         
         if not words:
-            self.bot.send_message(user_id, "У вас пока нет слов для удаления.")
+            self._send(user_id, "У вас пока нет слов для удаления.")
             return
         
-        markup = types.ReplyKeyboardMarkup(resize_keyboard=True, row_width=1)
-        for word_id, russian, english in words:
-            btn = types.KeyboardButton(f"{russian} - {english} (ID: {word_id})")
-            markup.add(btn)
-        
-        cancel_btn = types.KeyboardButton('Отмена ❌')
-        markup.add(cancel_btn)
-        
-        self.user_states[user_id] = self.DELETING_WORD
+        self.user_states[user_id] = self.IDLE
         
-        self.bot.send_message(
+        self._send(
             user_id,
             "Выберите слово для удаления:",
-            reply_markup=markup
+            reply_markup=self._build_delete_keyboard(words, 0)
         )
 
+    def _handle_delete_callback(self, call: types.CallbackQuery) -> None:
+        """Обработчик inline-кнопок удаления слова и перелистывания."""
+        user_id = call.from_user.id
+        db_user_id = self.get_user_id(user_id)
+        
+        if not db_user_id:
+            self.bot.answer_callback_query(call.id, "Пожалуйста, используйте /start для начала работы.")
+            return
+        
+        # del:<страница>:<ID слова> или delpage:<страница>
+        action, page, *word_id = call.data.split(':')
+        
+        if action == 'del':
+            if not self.delete_word(db_user_id, int(word_id[0])):
+                self.bot.answer_callback_query(
+                    call.id, "❌ Ошибка при удалении слова. Пожалуйста, попробуйте еще раз."
+                )
+                return
+            self.bot.answer_callback_query(call.id, "✅ Слово успешно удалено!")
+        else:
+            self.bot.answer_callback_query(call.id)
+        
+        words = self.get_user_words(db_user_id)
+        
+        if words:
+            self._edit(
+                call.message,
+                "Выберите слово для удаления:",
+                reply_markup=self._build_delete_keyboard(words, int(page))
+            )
+        else:
+            self._edit(call.message, "У вас больше нет слов.")
+
+    def _build_delete_keyboard(
+        self, words: List[Tuple[int, str, str]], page: int
+    ) -> types.InlineKeyboardMarkup:
+        """Inline-клавиатура со страницей слов для удаления."""
+        per_page = INTERFACE['words_per_page']
+        pages = (len(words) + per_page - 1) // per_page
+        page = max(0, min(page, pages - 1))
+        start = page * per_page
+        
+        markup = types.InlineKeyboardMarkup(row_width=2)
+        for word_id, russian, english in words[start:start + per_page]:
+            markup.row(types.InlineKeyboardButton(
+                f"{russian} - {english}", callback_data=f"del:{page}:{word_id}"
+            ))
+        
+        buttons = []
+        if page > 0:
+            buttons.append(types.InlineKeyboardButton('⬅️ Назад', callback_data=f"delpage:{page - 1}"))
+        if page < pages - 1:
+            buttons.append(types.InlineKeyboardButton('Вперед ➡️', callback_data=f"delpage:{page + 1}"))
+        if buttons:
+            markup.row(*buttons)
+        
+        return markup
+
     def _handle_words_list(self, message: types.Message) -> None:
         """Обработчик для кнопки 'Список слов'."""
         user_id = message.from_user.id
         db_user_id = self.get_user_id(user_id)
         
         if not db_user_id:
-            self.bot.send_message(user_id, "Пожалуйста, используйте /start для начала работы.")
+            self._send(user_id, "Пожалуйста, используйте /start для начала работы.")
             return
         
         words = self.get_user_words(db_user_id)
         
         if not words:
-            self.bot.send_message(
+            self._send(
                 user_id,
                 "У вас пока нет слов. Добавьте слова с помощью кнопки 'Добавить слово ➕'."
             )
             return
         
-        message_text = "📋 *Ваш список слов:*\n\n"
-        for i, (word_id, russian, english) in enumerate(words, 1):
-            message_text += f"{i}. {russian} - {english}\n"
-        
-        markup = self._create_main_keyboard()
+        message_text, markup = self._build_words_page(words, 0)
         
-        self.bot.send_message(
+        self._send(
             user_id,
             message_text,
-            reply_markup=markup,
+            reply_markup=markup or self._create_main_keyboard(),
             parse_mode='Markdown'
         )
 
+    def _handle_words_page(self, call: types.CallbackQuery) -> None:
+        """Обработчик кнопок перелистывания списка слов."""
+        user_id = call.from_user.id
+        db_user_id = self.get_user_id(user_id)
+        
+        if not db_user_id:
+            self.bot.answer_callback_query(call.id, "Пожалуйста, используйте /start для начала работы.")
+            return
+        
+        words = self.get_user_words(db_user_id)
+        
+        if not words:
+            self.bot.answer_callback_query(call.id, "У вас пока нет слов.")
+            return
+        
+        # Ответ на callback отправляется сразу, чтобы кнопка не "зависала"
+        self.bot.answer_callback_query(call.id)
+        
+        page = int(call.data.split(':', 1)[1])
+        message_text, markup = self._build_words_page(words, page)
+        
+        self._edit(call.message, message_text, reply_markup=markup, parse_mode='Markdown')
+
+    def _build_words_page(
+        self, words: List[Tuple[int, str, str]], page: int
+    ) -> Tuple[str, Optional[types.InlineKeyboardMarkup]]:
+        """Формирование страницы списка слов и кнопок перелистывания."""
+        per_page = INTERFACE['words_per_page']
+        pages = (len(words) + per_page - 1) // per_page
+        page = max(0, min(page, pages - 1))
+        start = page * per_page
+        
+        lines = [
+            f"{i}. {russian} - {english}"
+            for i, (word_id, russian, english) in enumerate(words[start:start + per_page], start + 1)
+        ]
+        message_text = "📋 *Ваш список слов:*\n\n" + "\n".join(lines) + "\n"
+        
+        if pages <= 1:
+            return message_text, None
+        
+        message_text += f"\nСтраница {page + 1} из {pages}"
+        
+        markup = types.InlineKeyboardMarkup(row_width=2)
+        buttons = []
+        if page > 0:
+            buttons.append(types.InlineKeyboardButton('⬅️ Назад', callback_data=f"words:{page - 1}"))
+        if page < pages - 1:
+            buttons.append(types.InlineKeyboardButton('Вперед ➡️', callback_data=f"words:{page + 1}"))
+        markup.add(*buttons)
+        
+        return message_text, markup
+
     def _handle_cancel(self, message: types.Message) -> None:
         """Обработчик для кнопки 'Отмена'."""
         user_id = message.from_user.id
         self.user_states[user_id] = self.IDLE
         
-        if user_id in self.temp_data:
-            del self.temp_data[user_id]
+        self.temp_data.pop(user_id, None)
         
         markup = self._create_main_keyboard()
         
-        self.bot.send_message(
+        self._send(
             user_id,
             "Действие отменено. Выберите другое действие:",
             reply_markup=markup
@@ -346,7 +671,7 @@ class EnglishBot:
         db_user_id = self.get_user_id(user_id)
         
         if not db_user_id:
-            self.bot.send_message(user_id, "Пожалуйста, используйте /start для начала работы.")
+            self._send(user_id, "Пожалуйста, используйте /start для начала работы.")
             return
         
         state = self.user_states.get(user_id, self.IDLE)
@@ -354,80 +679,61 @@ class EnglishBot:
         if state == self.ADDING_WORD_RUSSIAN:
             russian_word = message.text.strip().lower()
             
-            if user_id not in self.temp_data:
-                self.temp_data[user_id] = {}
-            self.temp_data[user_id]['russian'] = russian_word
+            self.temp_data[user_id] = {'russian': russian_word}
             
             self.user_states[user_id] = self.ADDING_WORD_ENGLISH
             
-            self.bot.send_message(
+            self._send(
                 user_id,
                 f"Теперь введите перевод слова '{russian_word}' на английском языке:"
             )
         
         elif state == self.ADDING_WORD_ENGLISH:
             english_word = message.text.strip().lower()
-            russian_word = self.temp_data[user_id]['russian']
+            data = self.temp_data.get(user_id)
+            
+            if not data:
+                self.user_states[user_id] = self.IDLE
+                self._send(
+                    user_id,
+                    "Время ожидания истекло. Пожалуйста, добавьте слово заново.",
+                    reply_markup=self._create_main_keyboard()
+                )
+                return
+            
+            russian_word = data['russian']
             
             success, word_count = self.add_word(db_user_id, russian_word, english_word)
             
             markup = self._create_main_keyboard()
             
             if success:
-                self.bot.send_message(
+                self._send(
                     user_id,
                     f"✅ Слово '{russian_word} - {english_word}' успешно добавлено!\n"
                     f"Всего у вас {word_count} слов для изучения.",
                     reply_markup=markup
                 )
             else:
-                self.bot.send_message(
+                self._send(
                     user_id,
                     "❌ Ошибка при добавлении слова. Пожалуйста, попробуйте еще раз.",
                     reply_markup=markup
                 )
             
             self.user_states[user_id] = self.IDLE
-            del self.temp_data[user_id]
-        
-        elif state == self.DELETING_WORD:
-            text = message.text
-            match = re.search(r'ID: (\d+)', text)
-            
-            if match:
-                word_id = int(match.group(1))
-                success = self.delete_word(db_user_id, word_id)
-                
-                markup = self._create_main_keyboard()
-                
-                if success:
-                    self.bot.send_message(
-                        user_id,
-                        "✅ Слово успешно удалено!",
-                        reply_markup=markup
-                    )
-                else:
-                    self.bot.send_message(
-                        user_id,
-                        "❌ Ошибка при удалении слова. Пожалуйста, попробуйте еще раз.",
-                        reply_markup=markup
-                    )
-                
-                self.user_states[user_id] = self.IDLE
+            self.temp_data.pop(user_id, None)
         
         elif state == self.QUIZ:
             user_answer = message.text.strip().lower()
-            word_id = self.quiz_data.get(user_id)
+            question = self.quiz_data.get(user_id)
             
-            if not word_id:
-                self.bot.send_message(user_id, "Произошла ошибка. Пожалуйста, начните викторину заново.")
+            if not question:
+                self._send(user_id, "Произошла ошибка. Пожалуйста, начните викторину заново.")
                 return
             
-            self.cursor.execute(
-                "SELECT english_word FROM words WHERE id = %s",
-                (word_id,)
-            )
-            correct_answer = self.cursor.fetchone()[0].lower()
+            word_id, correct_answer = question
+            correct_answer = correct_answer.lower()
             
             markup = self._create_main_keyboard()
             is_correct = user_answer.lower() == correct_answer.lower()
@@ -435,14 +741,14 @@ class EnglishBot:
             self.update_word_stats(db_user_id, word_id, is_correct)
             
             if is_correct:
-                self.bot.send_message(
+                self._send(
                     user_id,
                     f"✅ Правильно! '{user_answer}' - верный ответ.\n\n"
                     f"Нажмите 'Викторина 🎮' для следующего вопроса.",
                     reply_markup=markup
                 )
             else:
-                self.bot.send_message(
+                self._send(
                     user_id,
                     f"❌ Неправильно. Правильный ответ: '{correct_answer}'.\n\n"
                     f"Нажмите 'Викторина 🎮' для следующего вопроса.",
@@ -450,15 +756,34 @@ class EnglishBot:
                 )
             
             self.user_states[user_id] = self.IDLE
-            del self.quiz_data[user_id]
+            self.quiz_data.pop(user_id, None)
         
         else:
-            self.bot.send_message(
+            self._send(
                 user_id,
                 "Пожалуйста, выберите действие из меню ниже 👇"
             )
 
-    def _create_main_keyboard(self) -> types.ReplyKeyboardMarkup:
+    def _send(self, chat_id: int, text: str, **kwargs: Any) -> types.Message:
+        """Отправка сообщения с учетом ограничения частоты."""
+        self._send_limiter.acquire()
+        return self.bot.send_message(chat_id, text, **kwargs)
+
+    def _edit(self, message: types.Message, text: str, **kwargs: Any) -> None:
+        """Изменение сообщения с учетом ограничения частоты."""
+        self._send_limiter.acquire()
+        try:
+            self.bot.edit_message_text(text, message.chat.id, message.message_id, **kwargs)
+        except ApiTelegramException as e:
+            # Повторное нажатие той же кнопки не меняет сообщение
+            if 'message is not modified' not in e.description:
+                raise
+
+    def _create_main_keyboard(self) -> str:
+        """Основная клавиатура с кнопками в виде готового JSON."""
+        return self._main_markup
+
+    def _build_main_keyboard(self) -> types.ReplyKeyboardMarkup:
         """Создание основной клавиатуры с кнопками."""
         markup = types.ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
         quiz_btn = types.KeyboardButton('Викторина 🎮')
@@ -469,323 +794,547 @@ class EnglishBot:
         markup.add(quiz_btn, add_word_btn, delete_word_btn, words_list_btn)
         return markup
 
+    def _build_quiz_keyboard(self, options: List[str]) -> str:
+        """Клавиатура с вариантами ответа (по два в ряд) в виде готового JSON."""
+        rows = [
+            [{'text': option} for option in options[i:i + 2]]
+            for i in range(0, len(options), 2)
+        ]
+        return json.dumps({'keyboard': rows, 'resize_keyboard': True})
+
+    def _build_cancel_keyboard(self) -> types.ReplyKeyboardMarkup:
+        """Создание клавиатуры с единственной кнопкой отмены."""
+        markup = types.ReplyKeyboardMarkup(resize_keyboard=True, row_width=1)
+        cancel_btn = types.KeyboardButton('Отмена ❌')
+        markup.add(cancel_btn)
+        return markup
+
     def register_user(self, telegram_id: int, username: str) -> Optional[int]:
         """Регистрация нового пользователя."""
         try:
-            self.cursor.execute(
-                "SELECT id FROM users WHERE telegram_id = %s", 
-                (telegram_id,)
-            )
-            user = self.cursor.fetchone()
-            
-            if not user:
-                self.cursor.execute(
-                    "INSERT INTO users (telegram_id, username) VALUES (%s, %s) RETURNING id",
-                    (telegram_id, username)
-                )
-                user_id = self.cursor.fetchone()[0]
-                
-                self.cursor.execute(
+            with self._cursor() as cursor:
+                # Upsert пользователя; xmax = 0 только у только что вставленной
+                # строки, и лишь новому пользователю добавляются общие слова
+                self._execute_prepared(
+                    cursor, 'register_user', ('bigint', 'text'),
                     """
-                    INSERT INTO user_words (user_id, word_id)
-                    SELECT %s, id FROM words WHERE is_common = TRUE
+                    WITH upserted AS (
+                        INSERT INTO users (telegram_id, username)
+                        VALUES ($1, $2)
+                        ON CONFLICT (telegram_id) DO UPDATE SET username = EXCLUDED.username
+                        RETURNING id, (xmax = 0) AS inserted
+                    ), common AS (
+                        INSERT INTO user_words (user_id, word_id)
+                        SELECT upserted.id, words.id
+                        FROM upserted, words
+                        WHERE upserted.inserted AND words.is_common = TRUE
+                    )
+                    SELECT id, inserted FROM upserted
                     """,
-                    (user_id,)
+                    (telegram_id, username)
                 )
+                user_id, inserted = cursor.fetchone()
+                self._remember_user_id(telegram_id, user_id)
                 
-                print(f"Зарегистрирован новый пользователь: {username} (ID: {telegram_id})")
+                if inserted:
+                    logger.info(
+                        "Зарегистрирован новый пользователь: %s (ID: %s)", username, telegram_id
+                    )
                 return user_id
-            return user[0] if user else None
         except Exception as e:
-            print(f"Ошибка при регистрации пользователя: {e}")
+            logger.error("Ошибка при регистрации пользователя: %s", e)
             return None
 
+    def _remember_user_id(self, telegram_id: int, user_id: int) -> None:
+        """Сохранение ID пользователя в кэше."""
+        with self._user_ids_lock:
+            self._user_ids[telegram_id] = user_id
+
     def get_user_id(self, telegram_id: int) -> Optional[int]:
         """Получение ID пользователя по Telegram ID."""
+        with self._user_ids_lock:
+            cached = self._user_ids.get(telegram_id)
+        if cached is not None:
+            return cached
+        
         try:
-            self.cursor.execute(
-                "SELECT id FROM users WHERE telegram_id = %s", 
-                (telegram_id,)
-            )
-            user = self.cursor.fetchone()
-            return user[0] if user else None
+            with self._cursor() as cursor:
+                self._execute_prepared(
+                    cursor, 'get_user_id', ('bigint',),
+                    "SELECT id FROM users WHERE telegram_id = $1",
+                    (telegram_id,)
+                )
+                user = cursor.fetchone()
+                if not user:
+                    return None
+                self._remember_user_id(telegram_id, user[0])
+                return user[0]
         except Exception as e:
-            print(f"Ошибка при получении ID пользователя: {e}")
+            logger.error("Ошибка при получении ID пользователя: %s", e)
             return None
 
     def add_word(self, user_id: int, russian_word: str, english_word: str) -> Tuple[bool, int]:
         """Добавление нового слова для пользователя."""
         try:
-            self.cursor.execute(
-                "SELECT id FROM words WHERE russian_word = %s AND english_word = %s",
-                (russian_word, english_word)
-            )
-            word = self.cursor.fetchone()
-            
-            if not word:
-                self.cursor.execute(
-                    "INSERT INTO words (russian_word, english_word, is_common) "
-                    "VALUES (%s, %s, FALSE) RETURNING id",
-                    (russian_word, english_word)
+            with self._cursor() as cursor:
+                # Слово, связь с пользователем и подсчет слов - одним запросом.
+                # Основной запрос не видит строк, вставленных в CTE,
+                # поэтому новая связь досчитывается через new_link.
+                self._execute_prepared(
+                    cursor, 'add_word', ('text', 'text', 'integer'),
+                    """
+                    WITH word AS (
+                        INSERT INTO words (russian_word, english_word, is_common)
+                        VALUES ($1, $2, FALSE)
+                        ON CONFLICT (russian_word, english_word)
+                        DO UPDATE SET russian_word = EXCLUDED.russian_word
+                        RETURNING id
+                    ), new_link AS (
+                        INSERT INTO user_words (user_id, word_id)
+                        SELECT $3, id FROM word
+                        ON CONFLICT (user_id, word_id) DO NOTHING
+                        RETURNING 1
+                    )
+                    SELECT (SELECT COUNT(*) FROM user_words WHERE user_id = $3)
+                         + (SELECT COUNT(*) FROM new_link)
+                    """,
+                    (russian_word, english_word, user_id)
                 )
-                word_id = self.cursor.fetchone()[0]
-            else:
-                word_id = word[0]
-            
-            self.cursor.execute(
-                """
-                INSERT INTO user_words (user_id, word_id)
-                VALUES (%s, %s)
-                ON CONFLICT (user_id, word_id) DO NOTHING
-                """,
-                (user_id, word_id)
-            )
-            
-            self.cursor.execute(
-                "SELECT COUNT(*) FROM user_words WHERE user_id = %s",
-                (user_id,)
-            )
-            word_count = self.cursor.fetchone()[0]
-            
-            return True, word_count
+                word_count = cursor.fetchone()[0]
+                self._forget_user_words(user_id)
+                
+                return True, word_count
         except Exception as e:
-            print(f"Ошибка при добавлении слова: {e}")
+            logger.error("Ошибка при добавлении слова: %s", e)
             return False, 0
 
     def delete_word(self, user_id: int, word_id: int) -> bool:
         """Удаление слова у пользователя."""
         try:
-            self.cursor.execute(
-                "DELETE FROM user_words WHERE user_id = %s AND word_id = %s",
-                (user_id, word_id)
-            )
-            return True
+            with self._cursor() as cursor:
+                self._execute_prepared(
+                    cursor, 'delete_word', ('integer', 'integer'),
+                    "DELETE FROM user_words WHERE user_id = $1 AND word_id = $2",
+                    (user_id, word_id)
+                )
+                self._forget_user_words(user_id)
+                return True
         except Exception as e:
-            print(f"Ошибка при удалении слова: {e}")
+            logger.error("Ошибка при удалении слова: %s", e)
             return False
 
     def get_user_words(self, user_id: int) -> List[Tuple[int, str, str]]:
-        """Получение всех слов пользователя."""
+        """Получение всех слов пользователя (с кэшированием)."""
+        with self._user_words_lock:
+            cached = self._user_words_cache.get(user_id)
+            generation = self._user_words_generation
+        if cached is not None:
+            return cached
+        
         try:
-            self.cursor.execute(
-                """
-                SELECT w.id, w.russian_word, w.english_word
-                FROM words w
-                JOIN user_words uw ON w.id = uw.word_id
-                WHERE uw.user_id = %s
-                """,
-                (user_id,)
-            )
-            return self.cursor.fetchall()
+            with self._cursor() as cursor:
+                self._execute_prepared(
+                    cursor, 'get_user_words', ('integer',),
+                    """
+                    SELECT w.id, w.russian_word, w.english_word
+                    FROM words w
+                    JOIN user_words uw ON w.id = uw.word_id
+                    WHERE uw.user_id = $1
+                    ORDER BY w.id
+                    """,
+                    (user_id,)
+                )
+                words = cursor.fetchall()
+                with self._user_words_lock:
+                    if generation == self._user_words_generation:
+                        self._user_words_cache[user_id] = words
+                return words
         except Exception as e:
-            print(f"Ошибка при получении слов пользователя: {e}")
+            logger.error("Ошибка при получении слов пользователя: %s", e)
             return []
 
+    def _forget_user_words(self, user_id: int) -> None:
+        """Сброс кэша слов пользователя после изменения его словаря."""
+        with self._user_words_lock:
+            self._user_words_generation += 1
+            self._user_words_cache.pop(user_id, None)
+
     def get_random_word(self, user_id: int) -> Optional[Tuple[int, str, str]]:
         """Получение случайного слова для проверки знаний."""
-        try:
-            self.cursor.execute(
-                """
-                SELECT w.id, w.russian_word, w.english_word
-                FROM words w
-                JOIN user_words uw ON w.id = uw.word_id
-                WHERE uw.user_id = %s
-                ORDER BY RANDOM()
-                LIMIT 1
-                """,
-                (user_id,)
-            )
-            return self.cursor.fetchone()
-        except Exception as e:
-            print(f"Ошибка при получении случайного слова: {e}")
-            return None
+        words = self.get_user_words(user_id)
+        return self._rng.choice(words) if words else None
 
     def get_options(self, correct_word_id: int, user_id: int) -> Tuple[List[str], str]:
         """Получение вариантов ответа для викторины."""
         try:
-            self.cursor.execute(
-                "SELECT english_word FROM words WHERE id = %s",
-                (correct_word_id,)
+            words = self.get_user_words(user_id)
+            correct_answer = next(
+                (english for word_id, _, english in words if word_id == correct_word_id),
+                None
             )
-            correct_answer = self.cursor.fetchone()[0]
             
-            self.cursor.execute(
-                """
-                SELECT w.english_word
-                FROM words w
-                JOIN user_words uw ON w.id = uw.word_id
-                WHERE uw.user_id = %s AND w.id != %s
-                ORDER BY RANDOM()
-                LIMIT 3
-                """,
-                (user_id, correct_word_id)
-            )
+            if correct_answer is None:
+                with self._cursor() as cursor:
+                    cursor.execute(
+                        "SELECT english_word FROM words WHERE id = %s",
+                        (correct_word_id,)
+                    )
+                    correct_answer = cursor.fetchone()[0]
             
-            other_answers = [row[0] for row in self.cursor.fetchall()]
+            # Варианты сравниваются по тексту: у разных слов бывает один перевод (ты/вы -> you)
+            candidates = list(dict.fromkeys(
+                english for _, _, english in words if english != correct_answer
+            ))
+            other_answers = self._rng.sample(candidates, min(3, len(candidates)))
             
             if len(other_answers) < 3:
-                self.cursor.execute(
-                    """
-                    SELECT english_word
-                    FROM words
-                    WHERE id != %s AND english_word != %s
-                    ORDER BY RANDOM()
-                    LIMIT %s
-                    """,
-                    (correct_word_id, correct_answer, 3 - len(other_answers))
-                )
-                other_answers.extend([row[0] for row in self.cursor.fetchall()])
+                # Недостающие варианты добираются из общих слов
+                with self._cursor() as cursor:
+                    cursor.execute(
+                        """
+                        SELECT english_word
+                        FROM (
+                            SELECT DISTINCT english_word
+                            FROM words
+                            WHERE is_common AND english_word <> ALL(%s)
+                        ) w
+                        ORDER BY RANDOM()
+                        LIMIT %s
+                        """,
+                        ([correct_answer] + other_answers, 3 - len(other_answers))
+                    )
+                    other_answers.extend([row[0] for row in cursor.fetchall()])
             
             all_options = [correct_answer] + other_answers
-            random.shuffle(all_options)
+            self._rng.shuffle(all_options)
             
             return all_options, correct_answer
         except Exception as e:
-            print(f"Ошибка при получении вариантов ответа: {e}")
+            logger.error("Ошибка при получении вариантов ответа: %s", e)
             return [], ""
 
     def update_word_stats(self, user_id: int, word_id: int, is_correct: bool) -> bool:
         """Обновление статистики слова."""
         try:
-            self.cursor.execute(
-                """
-                UPDATE user_words
-                SET attempt_count = attempt_count + 1,
-                    correct_count = correct_count + %s
-                WHERE user_id = %s AND word_id = %s
-                """,
-                (1 if is_correct else 0, user_id, word_id)
-            )
-            return True
+            with self._cursor() as cursor:
+                self._execute_prepared(
+                    cursor, 'update_word_stats', ('integer', 'integer', 'integer'),
+                    """
+                    UPDATE user_words
+                    SET attempt_count = attempt_count + 1,
+                        correct_count = correct_count + $1
+                    WHERE user_id = $2 AND word_id = $3
+                    """,
+                    (1 if is_correct else 0, user_id, word_id)
+                )
+                return True
         except Exception as e:
-            print(f"Ошибка при обновлении статистики слова: {e}")
+            logger.error("Ошибка при обновлении статистики слова: %s", e)
             return False
 
     def close(self) -> None:
-        """Закрытие соединения с базой данных."""
-        if self.cursor:
-            self.cursor.close()
-        if self.conn:
-            self.conn.close()
-        print("Соединение с базой данных закрыто")
+        """Закрытие соединений с базой данных."""
+        if self.pool:
+            self.pool.closeall()
+        logger.info("Соединения с базой данных закрыто")
     
     def start(self) -> None:
         """Запуск бота."""
         try:
-            print("Бот запущен. Нажмите Ctrl+C для остановки.")
-            self.bot.infinity_polling()
+            # Оставшийся с прошлого запуска webhook блокирует getUpdates (ошибка 409)
+            self.bot.remove_webhook()
+            logger.info("Бот запущен. Нажмите Ctrl+C для остановки.")
+            self.bot.infinity_polling(
+                timeout=BOT_SETTINGS['polling_timeout'],
+                long_polling_timeout=BOT_SETTINGS['long_polling_timeout'],
+                skip_pending=BOT_SETTINGS['skip_pending']
+            )
         except Exception as e:
-            print(f"Ошибка при запуске бота: {e}")
+            logger.error("Ошибка при запуске бота: %s", e)
         finally:
             self.close()
 
+    def start_webhook(self, webhook_settings: Dict[str, Any]) -> None:
+        """Запуск бота в режиме webhook.
+        
+        Telegram сам присылает обновления на адрес
+        <url>/<BOT_TOKEN>/, поэтому запросов getUpdates нет.
+        Требуются пакеты fastapi и uvicorn.
+        """
+        try:
+            webhook_url = f"{webhook_settings['url'].rstrip('/')}/{self.token}/"
+            logger.info("Бот запущен в режиме webhook. Нажмите Ctrl+C для остановки.")
+            self.bot.run_webhooks(
+                listen=webhook_settings['listen'],
+                port=webhook_settings['port'],
+                certificate=webhook_settings['certificate'],
+                certificate_key=webhook_settings['certificate_key'],
+                webhook_url=webhook_url,
+                drop_pending_updates=BOT_SETTINGS['skip_pending']
+            )
+        except Exception as e:
+            logger.error("Ошибка при запуске бота: %s", e)
+        finally:
+            self.close()
 
-def check_host_availability(host: str, port: int = 5432, timeout: int = 5) -> bool:
-    """Проверка доступности хоста."""
-    try:
-        socket_obj = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        socket_obj.settimeout(timeout)
-        result = socket_obj.connect_ex((host, port))
-        socket_obj.close()
-        return result == 0
-    except Exception as e:
-        print(f"Ошибка при проверке доступности хоста: {e}")
-        return False
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Настройка логирования: запись в поток вывода идет в фоновом потоке."""
+    log_queue = queue.Queue(-1)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener.start()
+    return listener
+
+
+def _connect_server(db_config: Dict[str, Any], dbname: Optional[str] = None) -> PgConnection:
+    """Подключение к серверу PostgreSQL (к базе по умолчанию, если dbname не указана)."""
+    params = {
+        'user': db_config['user'],
+        'password': db_config['password'],
+        'host': db_config['host'],
+        'port': db_config['port'],
+        'connect_timeout': db_config['connect_timeout']
+    }
+    if dbname:
+        params['dbname'] = dbname
+    return psycopg2.connect(**params)
 
 
 def setup_database(db_config: Dict[str, Any]) -> bool:
     """Настройка базы данных на указанном хосте."""
-    if not check_host_availability(db_config['host'], int(db_config['port'])):
-        print(f"Хост {db_config['host']}:{db_config['port']} недоступен")
+    try:
+        conn = _connect_server(db_config)
+    except psycopg2.OperationalError as e:
+        # Роль без доступа к базе по умолчанию может работать с уже созданной базой бота
+        try:
+            _connect_server(db_config, db_config['dbname']).close()
+            return True
+        except psycopg2.OperationalError:
+            pass
+        logger.error(
+            "Не удалось подключиться к %s:%s: %s", db_config['host'], db_config['port'], e
+        )
         return False
     
     try:
-        conn = psycopg2.connect(
-            user=db_config['user'],
-            password=db_config['password'],
-            host=db_config['host'],
-            port=db_config['port']
-        )
         conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
         cursor = conn.cursor()
         
         cursor.execute(
-            f"SELECT 1 FROM pg_catalog.pg_database WHERE datname = '{db_config['dbname']}'"
+            "SELECT 1 FROM pg_catalog.pg_database WHERE datname = %s",
+            (db_config['dbname'],)
         )
         exists = cursor.fetchone()
         
         if not exists:
-            cursor.execute(f"CREATE DATABASE {db_config['dbname']}")
-            print(f"База данных '{db_config['dbname']}' успешно создана")
+            cursor.execute(
+                sql.SQL("CREATE DATABASE {}").format(sql.Identifier(db_config['dbname']))
+            )
+            logger.info("База данных '%s' успешно создана", db_config['dbname'])
         
         cursor.close()
         conn.close()
         return True
     except Exception as e:
-        print(f"Ошибка при настройке базы данных: {e}")
+        logger.error("Ошибка при настройке базы данных: %s", e)
         return False
 
 
+# Ответ сервера, который еще запускается (на английском и русском)
+_DB_STARTING_MESSAGES = ('the database system is starting up', 'система баз данных запускается')
+
+
+def _is_server_starting(db_config: Dict[str, Any], error: Exception) -> bool:
+    """Проверка, что ошибка подключения временная: сервер еще не слушает порт или запускается."""
+    import socket
+    
+    if any(message in str(error) for message in _DB_STARTING_MESSAGES):
+        return True
+    # Текст ошибки libpq зависит от локали, поэтому отказ в соединении
+    # проверяется по коду ошибки сокета
+    try:
+        socket.create_connection((db_config['host'], int(db_config['port'])), timeout=1).close()
+    except ConnectionRefusedError:
+        return True
+    except OSError:
+        pass
+    return False
+
+
+def wait_for_database(db_config: Dict[str, Any], deadline: float = 30) -> bool:
+    """Ожидание, пока сервер PostgreSQL начнет принимать соединения."""
+    stop_at = time.monotonic() + deadline
+    delay = 0.05
+    
+    while True:
+        # Запускающийся сервер уже принимает TCP-соединения, но отклоняет
+        # подключения, поэтому проверяется настоящее подключение
+        try:
+            _connect_server(db_config).close()
+            return True
+        except psycopg2.OperationalError as e:
+            # Ошибка пароля, отсутствие роли или базы ожиданием не исправятся
+            if not _is_server_starting(db_config, e):
+                logger.error("Не удалось подключиться к PostgreSQL: %s", e)
+                return False
+            if time.monotonic() + delay > stop_at:
+                logger.error("PostgreSQL не запустился за %s сек: %s", deadline, e)
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+
+# Метка времени последнего успешного apt-get update, выполненного ботом
+_APT_UPDATE_STAMP = '/var/lib/apt/periodic/english-bot-update-stamp'
+
+
+def _debian_install_commands() -> List[str]:
+    """Команды установки PostgreSQL для Debian/Ubuntu."""
+    import glob
+    
+    commands = []
+    # Списки пакетов, обновленные меньше часа назад, не скачиваются повторно.
+    # Время файлов списков apt берет с зеркала, поэтому после apt-get update
+    # пишется своя метка; без файлов списков (rm -rf /var/lib/apt/lists/*)
+    # обновление выполняется всегда
+    try:
+        update_age = time.time() - os.path.getmtime(_APT_UPDATE_STAMP)
+    except OSError:
+        update_age = float('inf')
+    if update_age > 3600 or not glob.glob('/var/lib/apt/lists/*_Packages*'):
+        commands.append(
+            f'apt-get update && mkdir -p {os.path.dirname(_APT_UPDATE_STAMP)} '
+            f'&& touch {_APT_UPDATE_STAMP}'
+        )
+    # Без терминала debconf не задает вопросов (например, о часовом поясе для tzdata);
+    # переменная задается в самой команде, так как sudo сбрасывает окружение
+    commands.append(
+        'DEBIAN_FRONTEND=noninteractive '
+        'apt-get install -y --no-install-recommends postgresql postgresql-contrib'
+    )
+    return commands
+
+
+def _rhel_install_commands() -> List[str]:
+    """Команды установки PostgreSQL для RHEL/Fedora."""
+    return [
+        'dnf install -y postgresql-server postgresql-contrib',
+        'postgresql-setup initdb'
+    ]
+
+
+# Файл-признак дистрибутива Linux -> команды установки PostgreSQL
+_LINUX_DISTROS = [
+    ('/etc/debian_version', _debian_install_commands),
+    ('/etc/redhat-release', _rhel_install_commands),
+]
+
+
+# Пути к brew после установки Homebrew (Apple Silicon и Intel)
+_BREW_PATHS = ('/opt/homebrew/bin/brew', '/usr/local/bin/brew')
+
+
 def install_postgresql() -> bool:
     """Установка PostgreSQL в зависимости от операционной системы."""
+    # Нужны только при установке, поэтому не загружаются при запуске бота
+    import shutil
+    import platform
+    import subprocess
+    
     os_name = platform.system().lower()
-    print(f"Определена операционная система: {os_name}")
+    logger.info("Определена операционная система: %s", os_name)
     
     if os_name == 'windows':
-        print("Для установки PostgreSQL на Windows:")
-        print("1. Скачайте установщик с https://www.postgresql.org/download/windows/")
-        print("2. Запустите установщик и следуйте инструкциям")
+        logger.info("Для установки PostgreSQL на Windows:")
+        logger.info("1. Скачайте установщик с https://www.postgresql.org/download/windows/")
+        logger.info("2. Запустите установщик и следуйте инструкциям")
         return False
     
     try:
         if os_name == 'linux':
-            if os.path.exists('/etc/debian_version'):
-                subprocess.run(['sudo', 'apt', 'update'], check=True)
-                subprocess.run(
-                    ['sudo', 'apt', 'install', '-y', 'postgresql', 'postgresql-contrib'],
-                    check=True
-                )
-            elif os.path.exists('/etc/redhat-release'):
-                subprocess.run(
-                    ['sudo', 'dnf', 'install', '-y', 'postgresql-server', 'postgresql-contrib'],
-                    check=True
-                )
-                subprocess.run(['sudo', 'postgresql-setup', 'initdb'], check=True)
+            commands = next(
+                (build() for marker, build in _LINUX_DISTROS if os.path.exists(marker)),
+                []
+            )
+            commands.append('systemctl enable --now postgresql')
             
-            subprocess.run(['sudo', 'systemctl', 'start', 'postgresql'], check=True)
-            subprocess.run(['sudo', 'systemctl', 'enable', 'postgresql'], check=True)
+            # Все шаги выполняются одной оболочкой под sudo; ход установки
+            # выводится в терминал, stderr сохраняется для лога ошибки
+            subprocess.run(
+                ['sudo', 'bash', '-c', ' && '.join(commands)],
+                check=True, stderr=subprocess.PIPE, text=True
+            )
             return True
         
         elif os_name == 'darwin':
-            try:
-                subprocess.run(['brew', '--version'], check=True, stdout=subprocess.PIPE)
-            except (subprocess.CalledProcessError, FileNotFoundError):
+            brew = shutil.which('brew')
+            if brew is None:
                 install_cmd = (
                     '/bin/bash -c "$(curl -fsSL '
                     'https://raw.githubusercontent.com/Homebrew/install/HEAD/install.sh)"'
                 )
                 subprocess.run(install_cmd, shell=True, check=True)
+                # Установщик не добавляет brew в PATH текущего процесса
+                brew = next((path for path in _BREW_PATHS if os.path.exists(path)), None)
+                if brew is None:
+                    logger.error("Homebrew не найден после установки")
+                    return False
             
-            subprocess.run(['brew', 'install', 'postgresql'], check=True)
-            subprocess.run(['brew', 'services', 'start', 'postgresql'], check=True)
+            subprocess.run(
+                [brew, 'install', 'postgresql'],
+                check=True, stderr=subprocess.PIPE, text=True
+            )
+            subprocess.run(
+                [brew, 'services', 'start', 'postgresql'],
+                check=True, stderr=subprocess.PIPE, text=True
+            )
             return True
         
-        print(f"Неподдерживаемая ОС: {os_name}")
+        logger.error("Неподдерживаемая ОС: %s", os_name)
         return False
     except subprocess.CalledProcessError as e:
-        print(f"Ошибка при установке PostgreSQL: {e}")
+        logger.error("Ошибка при установке PostgreSQL: %s", e)
+        if e.stderr:
+            logger.error("Вывод команды:\n%s", e.stderr.strip())
         return False
 
 
 if __name__ == '__main__':
-    print("Настройка подключения к базе данных")
-    if not setup_database(DB_CONFIG):
-        print("Не удалось настроить базу данных")
-        if input("Попробовать установить PostgreSQL? (y/n): ").lower() == 'y':
-            if install_postgresql():
-                time.sleep(5)
-                setup_database(DB_CONFIG)
-    
-    print("Запуск бота...")
-    bot = EnglishBot(BOT_TOKEN, DB_CONFIG)
-    bot.start()
+    log_listener = setup_logging()
+    try:
+        logger.info("Настройка подключения к базе данных")
+        database_ready = setup_database(DB_CONFIG)
+        if not database_ready:
+            logger.error("Не удалось настроить базу данных")
+            # Без терминала (systemd, CI) вопрос об установке не задается
+            if (sys.stdin.isatty()
+                    and input("Попробовать установить PostgreSQL? (y/n): ").lower() == 'y'):
+                database_ready = (
+                    install_postgresql()
+                    and wait_for_database(DB_CONFIG)
+                    and setup_database(DB_CONFIG)
+                )
+        
+        # Ни служебная база, ни база бота недоступны: бот работать не сможет
+        if not database_ready:
+            logger.error("База данных недоступна, бот не запущен")
+            sys.exit(1)
+        
+        logger.info("Запуск бота...")
+        try:
+            bot = EnglishBot(BOT_TOKEN, DB_CONFIG)
+        except RuntimeError as e:
+            logger.error("Бот не запущен: %s", e)
+            sys.exit(1)
+        if WEBHOOK['url']:
+            bot.start_webhook(WEBHOOK)
+        else:
+            bot.start()
+    finally:
+        log_listener.stop()